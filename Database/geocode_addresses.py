@@ -5,21 +5,324 @@ Supports multiple geocoding services with fallback options
 """
 
 import csv
+import logging
+import random
+import re
+import shelve
 import time
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 from typing import Dict, List, Tuple, Optional
 import argparse
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from urllib.parse import quote
 
+log = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 12
+PROGRESS_INTERVAL = 100  # Report progress after this many unique addresses
+MIN_REQUEST_INTERVAL = {'nominatim': 1.0}  # Seconds between requests, per Nominatim's usage policy
+POOL_SIZE = 32  # Pooled keep-alive connections per host
+OUTPUT_BUFFER_SIZE = 1 << 20  # Bytes buffered before the output CSV hits the disk
+
+# Rows that are written through without geocoding
+SKIP_PREFIX = 'Subtotal'
+NA_VALUES = {'#N/A', ''}
+SKIPPED_COLUMNS = ('', '', '', '', 'skipped')
+DEFAULT_CACHE_FILE = 'geocode_cache.db'
+CACHE_SYNC_INTERVAL = 50  # Flush the on-disk cache after this many new entries
+
+# Exponential backoff for HTTP 429 responses
+BACKOFF_BASE = 1.0
+BACKOFF_MAX_DELAY = 30.0
+BACKOFF_MAX_RETRIES = 3
+
+class RateLimitError(Exception):
+    """A service kept answering 429 Too Many Requests after every backoff retry"""
+
+class UnrecoverableError(Exception):
+    """A request failed in a way that retrying will not fix"""
+
+# Adaptive (AIMD) concurrency per geocoding service
+TARGET_LATENCY = 2.0  # Seconds; slower responses are treated as a sign of overload
+RATE_LIMIT_RESERVE = 0.1  # Pause when less than this fraction of the advertised quota remains
+
+class ConcurrencyController:
+    """
+    Client-side concurrency limit for one service using additive increase /
+    multiplicative decrease: the limit grows by 0.5 after each fast successful
+    response and halves on 429, 5xx, slow responses or connection failures.
+    A 429 also pauses the whole service (for Retry-After, or an exponential
+    backoff when none is sent), which is what throttles a service pinned at
+    one request in flight. Used as a context manager around each request;
+    entering waits out any pause and raises RateLimitError once the service
+    has been marked unavailable.
+    """
+    
+    def __init__(self, name: str, initial: float, min_limit: float = 1, max_limit: float = DEFAULT_WORKERS,
+                 target_latency: float = TARGET_LATENCY):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self._limit = max(min_limit, min(max_limit, initial))
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._unavailable: Optional[str] = None
+        self._rate_limited_streak = 0
+        self._condition = threading.Condition()
+    
+    def __enter__(self):
+        with self._condition:
+            while True:
+                if self._unavailable:
+                    raise RateLimitError(self._unavailable)
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    self._condition.wait(pause)
+                elif self._in_flight >= int(self._limit):
+                    self._condition.wait()
+                else:
+                    break
+            self._in_flight += 1
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+        return False
+    
+    def pause(self, seconds: float):
+        """Hold back every request to this service for the next few seconds"""
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._condition.notify_all()
+    
+    def mark_unavailable(self, reason: str):
+        """Refuse all further requests to this service for the rest of the run"""
+        with self._condition:
+            self._unavailable = reason
+            self._condition.notify_all()
+    
+    def on_result(self, status: Optional[int], latency: float, headers: Optional[Dict] = None):
+        """Adjust the limit after a response (status None means no response was received)"""
+        with self._condition:
+            if status is not None and status < 300 and latency <= self.target_latency:
+                self._limit = min(self.max_limit, self._limit + 0.5)
+            elif status is None or status == 429 or status >= 500 or latency > self.target_latency:
+                self._limit = max(self.min_limit, self._limit * 0.5)
+            
+            if status == 429:
+                self._on_rate_limited(headers)
+            elif status is not None:
+                self._rate_limited_streak = 0
+            
+            # Proactively pause when the server says the quota is nearly used up
+            if headers:
+                pause = self._quota_pause(headers)
+                if pause:
+                    self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            
+            self._condition.notify_all()
+    
+    def _on_rate_limited(self, headers: Optional[Dict]):
+        """Pause the service after a 429; called with the condition held"""
+        retry_after = parse_retry_after(headers.get('Retry-After')) if headers else None
+        if retry_after is not None and retry_after > BACKOFF_MAX_DELAY:
+            # Longer than our own backoff cap: leave the remaining rows as rate_limited for a rerun
+            self.mark_unavailable(
+                f"{self.name} asked us to retry after {retry_after:.0f}s; not using it for the rest of this run")
+            return
+        # Only 429s for requests sent after the last pause ended escalate the backoff
+        if time.monotonic() >= self._paused_until:
+            self._rate_limited_streak += 1
+        delay = min(BACKOFF_MAX_DELAY,
+                    BACKOFF_BASE * 2 ** (self._rate_limited_streak - 1) * (1 + random.random() * 0.5))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        self.pause(delay)
+    
+    @staticmethod
+    def _quota_pause(headers) -> Optional[float]:
+        """Seconds to wait according to X-RateLimit-* headers, if the quota is almost exhausted"""
+        try:
+            remaining = float(headers['X-RateLimit-Remaining'])
+            quota = float(headers['X-RateLimit-Limit'])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if quota <= 0 or remaining >= quota * RATE_LIMIT_RESERVE:
+            return None
+        try:
+            reset = float(headers.get('X-RateLimit-Reset', 1))
+        except (TypeError, ValueError):
+            reset = 1.0
+        # Some services send an epoch timestamp rather than a delay
+        if reset > 1e9:
+            reset -= time.time()
+        return min(BACKOFF_MAX_DELAY, max(0.0, reset))
+
+def load_postcode_centroids(postcode_file: str) -> Dict[Tuple[str, str], Tuple[float, float]]:
+    """
+    Load a suburb/postcode centroid table (e.g. the australian_postcodes CSV or a GNAF
+    locality extract) keyed by (SUBURB, postcode). Header names are matched loosely:
+    locality/suburb, postcode, lat/latitude and long/lon/longitude.
+    """
+    centroids = {}
+    with open(postcode_file, 'r', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        columns = {name.strip().lower(): name for name in reader.fieldnames or []}
+        
+        def column(*candidates):
+            for candidate in candidates:
+                if candidate in columns:
+                    return columns[candidate]
+            raise ValueError(f"{postcode_file} has no {'/'.join(candidates)} column")
+        
+        suburb_column = column('locality', 'suburb')
+        postcode_column = column('postcode')
+        lat_column = column('lat', 'latitude')
+        lon_column = column('long', 'lon', 'longitude')
+        
+        for row in reader:
+            try:
+                lat = float(row[lat_column])
+                lon = float(row[lon_column])
+            except (TypeError, ValueError):
+                continue
+            suburb = (row[suburb_column] or '').strip().upper()
+            postcode = (row[postcode_column] or '').strip()
+            # Several delivery areas can share a suburb/postcode; keep the first usable one
+            if suburb and postcode and lat and lon:
+                centroids.setdefault((suburb, postcode), (lat, lon))
+    return centroids
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP-date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
 class AddressGeocoder:
-    def __init__(self):
+    def __init__(self, max_workers: int = DEFAULT_WORKERS, cache_file: Optional[str] = DEFAULT_CACHE_FILE,
+                 postcode_file: Optional[str] = None):
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Address Geocoder 1.0'
+            'User-Agent': 'Address Geocoder 1.0',
+            'Connection': 'keep-alive'
         })
+        # Keep enough pooled connections for every worker so TLS handshakes are reused
+        pool_size = max(POOL_SIZE, max_workers)
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=['GET'],
+                raise_on_status=False
+            )
+        )
+        self.session.mount('https://', adapter)
+        # Per-service concurrency slots. Photon's adapt to what the host tolerates; Nominatim's
+        # usage policy allows one request at a time (and one per second, see MIN_REQUEST_INTERVAL)
+        self._service_slots = {
+            'nominatim': ConcurrencyController('nominatim', 1, max_limit=1),
+            'photon': ConcurrencyController('photon', max_workers, max_limit=max_workers)
+        }
+        # Monotonic time of the last request to each service with a minimum request interval
+        self._last_request: Dict[str, float] = {}
+        self._interval_lock = threading.Lock()
         
+        # Successful lookups keyed by normalized address -> (lat, lon, service).
+        # The persistent shelf is loaded into memory once so lookups are plain dict hits
+        self._cache: Dict[str, Tuple[float, float, str]] = {}
+        self._cache_lock = threading.Lock()
+        self._unsynced_writes = 0
+        self._shelf = shelve.open(cache_file) if cache_file else None
+        if self._shelf is not None:
+            self._cache.update(dict(self._shelf))
+        
+        # Optional offline (SUBURB, postcode) -> (lat, lon) table for suburb-level precision
+        self._postcode_centroids = load_postcode_centroids(postcode_file) if postcode_file else {}
+    
+    def close(self):
+        """Flush and close the persistent geocode cache"""
+        if self._shelf is not None:
+            with self._cache_lock:
+                self._shelf.close()
+                self._shelf = None
+    
+    @staticmethod
+    def cache_key(address: str) -> str:
+        """Normalize an address string so trivially different spellings share a cache entry"""
+        return re.sub(r'\s+', ' ', address.lower().strip())
+    
+    def _store_in_cache(self, key: str, value: Tuple[float, float, str]):
+        with self._cache_lock:
+            self._cache[key] = value
+            if self._shelf is not None:
+                self._shelf[key] = value
+                self._unsynced_writes += 1
+                if self._unsynced_writes >= CACHE_SYNC_INTERVAL:
+                    self._shelf.sync()
+                    self._unsynced_writes = 0
+        
+    def _wait_for_turn(self, service: str):
+        """Sleep until the service's minimum request interval has passed since its last request"""
+        interval = MIN_REQUEST_INTERVAL.get(service)
+        if not interval:
+            return
+        with self._interval_lock:
+            wait = self._last_request.get(service, float('-inf')) + interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_request[service] = time.monotonic()
+    
+    def _get_with_backoff(self, service: str, url: str, params: Dict) -> requests.Response:
+        """
+        GET a geocoding endpoint, retrying on 429. The service's controller turns
+        each 429 into a pause for every worker (see ConcurrencyController), so the
+        retry simply waits its turn
+        """
+        controller = self._service_slots[service]
+        for _ in range(BACKOFF_MAX_RETRIES + 1):
+            with controller:
+                self._wait_for_turn(service)
+                started = time.monotonic()
+                try:
+                    response = self.session.get(url, params=params, timeout=10)
+                except requests.RequestException as e:
+                    controller.on_result(None, time.monotonic() - started)
+                    raise UnrecoverableError(str(e)) from e
+                controller.on_result(response.status_code, time.monotonic() - started, response.headers)
+            
+            if response.status_code != 429:
+                try:
+                    response.raise_for_status()
+                except requests.HTTPError as e:
+                    raise UnrecoverableError(str(e)) from e
+                return response
+        
+        raise RateLimitError(f"{service} rate limit exceeded after {BACKOFF_MAX_RETRIES} retries")
+    
     def geocode_nominatim(self, address: str) -> Optional[Tuple[float, float]]:
         """
         Geocode using OpenStreetMap Nominatim (free, no API key required)
@@ -34,17 +337,18 @@ class AddressGeocoder:
                 'countrycodes': 'au'  # Limit to Australia based on your data
             }
             
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
+            response = self._get_with_backoff('nominatim', url, params)
             
-            data = response.json()
+            data = orjson.loads(response.content)
             if data:
                 lat = float(data[0]['lat'])
                 lon = float(data[0]['lon'])
                 return (lat, lon)
                 
+        except RateLimitError:
+            raise
         except Exception as e:
-            print(f"Nominatim error for '{address}': {e}")
+            log.warning("Nominatim error for '%s': %s", address, e)
             
         return None
     
@@ -61,41 +365,59 @@ class AddressGeocoder:
                 'osm_tag': 'place'
             }
             
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
+            response = self._get_with_backoff('photon', url, params)
             
-            data = response.json()
+            data = orjson.loads(response.content)
             if data.get('features'):
                 coords = data['features'][0]['geometry']['coordinates']
                 # Photon returns [lon, lat], we want (lat, lon)
                 return (coords[1], coords[0])
                 
+        except RateLimitError:
+            raise
         except Exception as e:
-            print(f"Photon error for '{address}': {e}")
+            log.warning("Photon error for '%s': %s", address, e)
             
         return None
     
     def format_address(self, street: str, city: str, state: str, postcode: str) -> str:
-        """Format address components into a single string"""
-        parts = []
-        
-        if street and street.strip() and street != '#N/A':
-            parts.append(street.strip().rstrip(','))
-        if city and city.strip() and city != '#N/A':
-            parts.append(city.strip())
-        if state and state.strip() and state != '#N/A':
-            parts.append(state.strip())
-        if postcode and postcode.strip() and postcode != '#N/A':
-            parts.append(postcode.strip())
-            
-        return ', '.join(parts)
+        """Format address components into a single string, dropping blank and #N/A parts"""
+        parts = (
+            street.strip().rstrip(',') if street else '',
+            city.strip() if city else '',
+            state.strip() if state else '',
+            postcode.strip() if postcode else ''
+        )
+        return ', '.join(part for part in parts if part not in NA_VALUES)
     
-    def geocode_address(self, street: str, city: str, state: str, postcode: str) -> Dict:
+    def geocode_offline(self, address: str, city: str, postcode: str) -> Optional[Dict]:
         """
-        Geocode a single address using multiple services with fallback
+        Resolve an address to its suburb/postcode centroid from the offline table,
+        or None if there is no table or no matching entry
         """
+        if not address or not city or not postcode:
+            return None
+        coords = self._postcode_centroids.get((city.strip().upper(), postcode.strip()))
+        if coords:
+            return {
+                'formatted_address': address,
+                'latitude': coords[0],
+                'longitude': coords[1],
+                'geocoding_service': 'postcode_centroid',
+                'status': 'success'
+            }
+        return None
+    
+    def geocode_address(self, street: str, city: str, state: str, postcode: str) -> Dict:
+        """Geocode a single address given as its components, trying the offline table first"""
         address = self.format_address(street, city, state, postcode)
-        
+        return self.geocode_offline(address, city, postcode) or self.geocode(address)
+    
+    def geocode(self, address: str) -> Dict:
+        """
+        Geocode a formatted address using multiple services with fallback.
+        Safe to call from several worker threads at once.
+        """
         if not address or address.strip() == '':
             return {
                 'formatted_address': '',
@@ -105,11 +427,34 @@ class AddressGeocoder:
                 'status': 'empty_address'
             }
         
-        print(f"Geocoding: {address}")
+        key = self.cache_key(address)
+        cached = self._cache.get(key)
+        if cached:
+            return {
+                'formatted_address': address,
+                'latitude': cached[0],
+                'longitude': cached[1],
+                'geocoding_service': cached[2],
+                'status': 'success'
+            }
+        
+        log.debug("Geocoding: %s", address)
         
-        # Try Nominatim first
-        coords = self.geocode_nominatim(address)
+        # Try Nominatim first. Only a genuine failure falls back to Photon; if we are
+        # being rate limited the row is reported as such so a later run can retry it
+        try:
+            coords = self.geocode_nominatim(address)
+        except RateLimitError as e:
+            log.warning("Rate limited for '%s': %s", address, e)
+            return {
+                'formatted_address': address,
+                'latitude': None,
+                'longitude': None,
+                'geocoding_service': None,
+                'status': 'rate_limited'
+            }
         if coords:
+            self._store_in_cache(key, (coords[0], coords[1], 'nominatim'))
             return {
                 'formatted_address': address,
                 'latitude': coords[0],
@@ -121,8 +466,19 @@ class AddressGeocoder:
         # No wait between services for faster processing
         
         # Try Photon as fallback
-        coords = self.geocode_photon(address)
+        try:
+            coords = self.geocode_photon(address)
+        except RateLimitError as e:
+            log.warning("Rate limited for '%s': %s", address, e)
+            return {
+                'formatted_address': address,
+                'latitude': None,
+                'longitude': None,
+                'geocoding_service': None,
+                'status': 'rate_limited'
+            }
         if coords:
+            self._store_in_cache(key, (coords[0], coords[1], 'photon'))
             return {
                 'formatted_address': address,
                 'latitude': coords[0],
@@ -139,18 +495,17 @@ class AddressGeocoder:
             'status': 'failed'
         }
 
-def process_csv(input_file: str, output_file: str, start_row: int = 0, max_rows: int = None):
+def process_csv(input_file: str, output_file: str, start_row: int = 0, max_rows: int = None,
+                max_workers: int = DEFAULT_WORKERS, cache_file: Optional[str] = DEFAULT_CACHE_FILE,
+                postcode_file: Optional[str] = None):
     """Process the CSV file and add geocoding results"""
     
-    geocoder = AddressGeocoder()
-    batch_results = []
+    geocoder = AddressGeocoder(max_workers, cache_file, postcode_file)
     processed_count = 0
     success_count = 0
-    batch_size = 10
     
     print(f"Reading {input_file}...")
     
-    # Initialize output file with headers
     with open(input_file, 'r', encoding='utf-8') as f:
         reader = csv.reader(f)
         headers = next(reader)  # Read header row
@@ -164,11 +519,6 @@ def process_csv(input_file: str, output_file: str, start_row: int = 0, max_rows:
             'Geocoding_Status'
         ]
         
-        # Write headers to output file
-        with open(output_file, 'w', encoding='utf-8', newline='') as out_f:
-            writer = csv.writer(out_f)
-            writer.writerow(new_headers)
-        
         # Skip to start row if specified
         for _ in range(start_row):
             try:
@@ -176,61 +526,95 @@ def process_csv(input_file: str, output_file: str, start_row: int = 0, max_rows:
             except StopIteration:
                 break
         
-        for row_num, row in enumerate(reader, start=start_row + 1):
-            if max_rows and processed_count >= max_rows:
+        # First pass: read all rows, format the address of each row that needs geocoding
+        # and resolve what we can from the offline postcode table
+        rows = []
+        addresses = {}  # row_index -> formatted address
+        geocode_results = {}  # formatted address -> geocoding result
+        for row in reader:
+            if max_rows and len(addresses) >= max_rows:
                 break
-                
-            # Skip subtotal rows and rows with #N/A addresses
-            if (len(row) > 10 and 
-                row[10] not in ['#N/A', '', None] and 
-                not row[0].startswith('Subtotal')):
-                
-                # Extract address components (columns 10-13 are indices 10-13)
-                street = row[10] if len(row) > 10 else ''
-                city = row[11] if len(row) > 11 else ''
-                state = row[12] if len(row) > 12 else ''
-                postcode = row[13] if len(row) > 13 else ''
-                
-                # Geocode the address
-                geocode_result = geocoder.geocode_address(street, city, state, postcode)
-                
-                if geocode_result['status'] == 'success':
-                    success_count += 1
-                
-                # Add geocoding results to the row
-                new_row = row + [
-                    geocode_result['formatted_address'],
-                    geocode_result['latitude'],
-                    geocode_result['longitude'],
-                    geocode_result['geocoding_service'],
-                    geocode_result['status']
-                ]
-                
-                processed_count += 1
-                print(f"Processed {processed_count} addresses, {success_count} successful")
-                
-                # No rate limiting for faster processing
-                
-            else:
-                # For rows without addresses, add empty geocoding columns
-                new_row = row + ['', '', '', '', 'skipped']
             
-            batch_results.append(new_row)
+            # Subtotal rows and rows with #N/A addresses get their empty geocoding columns
+            # straight away and never reach the geocoder
+            if len(row) <= 10 or row[10] in NA_VALUES or row[0].startswith(SKIP_PREFIX):
+                rows.append([*row, *SKIPPED_COLUMNS])
+                continue
             
-            # Write batch when we reach batch_size
-            if len(batch_results) >= batch_size:
-                with open(output_file, 'a', encoding='utf-8', newline='') as out_f:
-                    writer = csv.writer(out_f)
-                    writer.writerows(batch_results)
-                print(f"Wrote batch of {len(batch_results)} rows to {output_file}")
-                batch_results = []  # Clear the batch
-        
-        # Write any remaining results in the final batch
-        if batch_results:
-            with open(output_file, 'a', encoding='utf-8', newline='') as out_f:
-                writer = csv.writer(out_f)
-                writer.writerows(batch_results)
-            print(f"Wrote final batch of {len(batch_results)} rows to {output_file}")
+            # Extract address components (columns 10-13 are indices 10-13)
+            street = row[10]
+            city = row[11] if len(row) > 11 else ''
+            state = row[12] if len(row) > 12 else ''
+            postcode = row[13] if len(row) > 13 else ''
+            address = geocoder.format_address(street, city, state, postcode)
+            addresses[len(rows)] = address
+            rows.append(row)
+            
+            if address not in geocode_results:
+                offline_result = geocoder.geocode_offline(address, city, postcode)
+                if offline_result:
+                    geocode_results[address] = offline_result
+    
+    # Second pass: geocode each remaining distinct address exactly once on a thread pool, so
+    # shared addresses cost one lookup and workers never race on the same cache entry.
+    # Rows are joined with their results and written as soon as those results arrive, so an
+    # interrupted run leaves every row before the interruption in the output file
+    unique_addresses = [address for address in dict.fromkeys(addresses.values())
+                        if address not in geocode_results]
+    print(f"Found {len(unique_addresses) + len(geocode_results)} unique addresses across {len(addresses)} rows"
+          f" ({len(geocode_results)} resolved from the postcode table)")
+    rows_written = 0
+    try:
+        with open(output_file, 'w', encoding='utf-8', newline='', buffering=OUTPUT_BUFFER_SIZE) as out_f, \
+                ThreadPoolExecutor(max_workers=max_workers) as executor:
+            writer = csv.writer(out_f)
+            writer.writerow(new_headers)
+            
+            results = zip(unique_addresses, executor.map(geocoder.geocode, unique_addresses))
+            geocoded_count = 0
+            try:
+                for row_index, row in enumerate(rows):
+                    address = addresses.get(row_index)
+                    if address is None:
+                        # Skipped rows already carry their empty geocoding columns
+                        writer.writerow(row)
+                        rows_written += 1
+                        continue
+                    
+                    # Results come back in order of first appearance, so a row's address is
+                    # either already known or the next result due
+                    while address not in geocode_results:
+                        geocoded_address, geocode_result = next(results)
+                        geocode_results[geocoded_address] = geocode_result
+                        geocoded_count += 1
+                        # Only this (main) thread reports progress; workers just log problems
+                        if geocoded_count % PROGRESS_INTERVAL == 0 or geocoded_count == len(unique_addresses):
+                            log.info("Geocoded %d/%d unique addresses", geocoded_count, len(unique_addresses))
+                    
+                    geocode_result = geocode_results[address]
+                    if geocode_result['status'] == 'success':
+                        success_count += 1
+                    processed_count += 1
+                    
+                    # Add geocoding results to the row
+                    writer.writerow(row + [
+                        geocode_result['formatted_address'],
+                        geocode_result['latitude'],
+                        geocode_result['longitude'],
+                        geocode_result['geocoding_service'],
+                        geocode_result['status']
+                    ])
+                    rows_written += 1
+            except BaseException:
+                # Don't wait for lookups that haven't started yet
+                executor.shutdown(cancel_futures=True)
+                log.info("Wrote %d rows to %s before stopping; resume with -s %d",
+                         rows_written, output_file, start_row + rows_written)
+                raise
+    finally:
+        geocoder.close()
+    
+    print(f"Wrote {len(rows)} rows to {output_file}")
     
     print(f"\nCompleted!")
     print(f"Total addresses processed: {processed_count}")
@@ -246,18 +630,33 @@ def main():
                        help='Start row number (0-based, default: 0)')
     parser.add_argument('-m', '--max', type=int, 
                        help='Maximum number of addresses to process')
+    parser.add_argument('-w', '--workers', type=int, default=DEFAULT_WORKERS,
+                       help=f'Number of parallel geocoding workers (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--cache', default=DEFAULT_CACHE_FILE,
+                       help=f'Persistent geocode cache file (default: {DEFAULT_CACHE_FILE})')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Disable the persistent geocode cache')
+    parser.add_argument('-p', '--postcodes',
+                       help='CSV of suburb/postcode centroids; matching addresses are resolved offline '
+                            'to suburb-level precision instead of being sent to the geocoding services')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                       help='Log every address as it is geocoded')
     parser.add_argument('--test', action='store_true',
                        help='Test mode - process only first 10 addresses')
     
     args = parser.parse_args()
     
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format='%(message)s')
+    
     if args.test:
         args.max = 10
         args.output = 'test_geocoding_results.csv'
         print("Running in test mode - processing first 10 addresses only")
     
     try:
-        process_csv(args.input_file, args.output, args.start, args.max)
+        cache_file = None if args.no_cache else args.cache
+        process_csv(args.input_file, args.output, args.start, args.max, args.workers, cache_file,
+                    args.postcodes)
     except KeyboardInterrupt:
         print("\nProcess interrupted by user")
         sys.exit(1)
@@ -6,16 +6,152 @@ Extracts data from alldata_with_coordinates.csv and creates normalized tables
 
 import csv
 import json
-from datetime import datetime
-from typing import Dict, Set, List
+from dataclasses import dataclass, fields
+from typing import Dict, Set, List, Optional
 import argparse
+import io
+import os
+from itertools import islice
+from operator import attrgetter, itemgetter
+
+import pandas as pd
+
+CHUNK_SIZE = 50_000  # Rows per chunk when streaming the input CSV
+INSERT_BATCH_SIZE = 1000  # Rows per multi-row INSERT statement
+SQL_FLUSH_SIZE = 16 * 1024 * 1024  # Characters of SQL buffered in memory between file writes
+STATEMENTS_PER_WRITE = 100  # INSERT statements handed to each writelines() call
+
+# Input CSV columns used by the normalizer
+COL_DETAILED_ITEM_ID = 'Detailed Item ID  ↓'
+COL_DETAILED_ITEM_NAME = 'Detailed Item Name'
+COL_ITEM_ID = 'Item ID'
+COL_ITEM_NAME = 'Item Name'
+COL_CAPABILITY = 'Organisation Capability'
+COL_CAPABILITY_TYPE = 'Capability Type'
+COL_VALIDATION_DATE = 'Validation Date'
+COL_ORGANISATION_ID = 'Organisation: Organisation ID'
+COL_ORGANISATION_NAME = 'Organisation: Organisation Name'
+COL_BILLING_STREET = 'Organisation: Billing Street'
+COL_BILLING_CITY = 'Organisation: Billing City'
+COL_BILLING_STATE = 'Organisation: Billing State/Province'
+COL_BILLING_POSTCODE = 'Organisation: Billing Zip/Postal Code'
+COL_SECTOR_MAPPING_ID = 'Sector Mapping ID'
+COL_SECTOR_NAME = 'Sector Name'
+COL_FORMATTED_ADDRESS = 'Formatted_Address'
+COL_LATITUDE = 'Latitude'
+COL_LONGITUDE = 'Longitude'
+INPUT_COLUMNS = [
+    COL_DETAILED_ITEM_ID, COL_DETAILED_ITEM_NAME, COL_ITEM_ID, COL_ITEM_NAME,
+    COL_CAPABILITY, COL_CAPABILITY_TYPE, COL_VALIDATION_DATE,
+    COL_ORGANISATION_ID, COL_ORGANISATION_NAME, COL_BILLING_STREET, COL_BILLING_CITY,
+    COL_BILLING_STATE, COL_BILLING_POSTCODE, COL_SECTOR_MAPPING_ID, COL_SECTOR_NAME,
+    COL_FORMATTED_ADDRESS, COL_LATITUDE, COL_LONGITUDE
+]
+
+# Column order of each output table (SQL and CSV)
+ITEM_COLUMNS = ['itemId', 'itemName']
+DETAILED_ITEM_COLUMNS = ['detailedItemId', 'detailedItemName', 'itemId']
+SECTOR_COLUMNS = ['sectorMappingId', 'sectorName']
+ORGANISATION_COLUMNS = [
+    'organisationId', 'organisationName', 'billingStreet', 'billingCity',
+    'billingStateProvince', 'billingZipPostalCode', 'formattedAddress',
+    'latitude', 'longitude'
+]
+CAPABILITY_COLUMNS = [
+    'organisationCapability', 'organisationId', 'itemId', 'detailedItemId',
+    'capabilityType', 'validationDate', 'sectorMappingId'
+]
+
+def format_value(value) -> str:
+    """Format a value as a SQL literal, escaping quotes and mapping None/blank to NULL"""
+    if value is None or value == '':
+        return 'NULL'
+    elif isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    elif isinstance(value, (int, float)):
+        return str(value)
+    else:
+        return "'" + str(value).replace("'", "''") + "'"
+
+def _flush_buffer(f, buf: io.StringIO):
+    """Move everything accumulated in buf to the file and empty it"""
+    f.write(buf.getvalue())
+    buf.seek(0)
+    buf.truncate(0)
+
+def _insert_statements(table: str, columns: List[str], rows):
+    """Lazily yield INSERT statements of up to INSERT_BATCH_SIZE rows of raw values each"""
+    row_template = ('(' + ', '.join(['{}'] * len(columns)) + ')').format
+    statement = f"INSERT INTO {table} ({', '.join(columns)}) VALUES\n"
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, INSERT_BATCH_SIZE))
+        if not batch:
+            break
+        yield statement + ",\n".join(row_template(*map(format_value, row)) for row in batch) + ";\n"
+
+def _write_inserts(f, buf: io.StringIO, table: str, columns: List[str], rows):
+    """
+    Write a table's INSERT statements into buf with writelines, a slice of statements
+    per call, flushing buf to f once it holds SQL_FLUSH_SIZE characters
+    """
+    statements = _insert_statements(table, columns, rows)
+    while True:
+        size = buf.tell()
+        buf.writelines(islice(statements, STATEMENTS_PER_WRITE))
+        if buf.tell() == size:
+            break
+        if buf.tell() >= SQL_FLUSH_SIZE:
+            _flush_buffer(f, buf)
+
+def parse_validation_dates(dates: pd.Series) -> pd.Series:
+    """
+    Convert d/m/Y validation dates to ISO format for a whole column at once;
+    other formats pass through unchanged and blank or invalid dates become NaN
+    """
+    day_first = dates.str.contains('/', regex=False)
+    iso_dates = pd.to_datetime(dates.where(day_first), format='%d/%m/%Y', errors='coerce').dt.strftime('%Y-%m-%d')
+    return iso_dates.where(day_first, dates.where(dates != ''))
+
+def _float_column(series: pd.Series) -> pd.Series:
+    """Parse a column of numeric strings exactly (round-trip precision); bad values become NaN"""
+    try:
+        return series.replace('', pd.NA).astype('float64')
+    except (TypeError, ValueError):
+        def parse(value):
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return float('nan')
+        return series.astype(object).map(parse).astype('float64')
+
+@dataclass(slots=True)
+class Organisation:
+    """One row of the Organisations table"""
+    organisationId: str
+    organisationName: Optional[str] = None
+    billingStreet: Optional[str] = None
+    billingCity: Optional[str] = None
+    billingStateProvince: Optional[str] = None
+    billingZipPostalCode: Optional[str] = None
+    formattedAddress: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    
+    def merge(self, other: 'Organisation'):
+        """Fill in any fields that are still empty from another record of the same organisation"""
+        for field in fields(self):
+            if not getattr(self, field.name):
+                value = getattr(other, field.name)
+                if value:
+                    setattr(self, field.name, value)
 
 class DataNormalizer:
     def __init__(self):
         self.items = {}  # itemId -> itemName
         self.detailed_items = {}  # detailedItemId -> {detailedItemName, itemId}
         self.sectors = {}  # sectorMappingId -> sectorName
-        self.organisations = {}  # organisationId -> organisation info
+        self.organisations: Dict[str, Organisation] = {}  # organisationId -> Organisation
         self.capabilities = []  # List of capability records
         
     def process_csv(self, input_file: str):
@@ -23,142 +159,122 @@ class DataNormalizer:
         
         print(f"Processing {input_file}...")
         
-        # Keep track of the current detailed item ID and sector mapping ID for grouped rows
+        # Keep track of the current detailed item ID and sector mapping ID for grouped rows.
+        # Carried from one chunk to the next so groups spanning a chunk boundary still resolve
         current_detailed_item_id = None
         current_sector_mapping_id = None
+        rows_read = 0
         
-        with open(input_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+        # Stream the file in chunks of plain strings, parsing only the columns we use;
+        # utf-8-sig drops the BOM from the first header
+        chunks = pd.read_csv(input_file, dtype=str, keep_default_na=False, encoding='utf-8-sig',
+                             usecols=lambda column: column in INPUT_COLUMNS, chunksize=CHUNK_SIZE)
+        for chunk in chunks:
+            rows_read += len(chunk)
+            # Columns missing from the input (e.g. before geocoding) read as blank; strip everything in one pass
+            df = chunk.reindex(columns=INPUT_COLUMNS).fillna('').apply(lambda column: column.str.strip())
+            
+            # Skip rows without valid organisation data
+            df = df[df[COL_ORGANISATION_ID] != '']
+            if df.empty:
+                print(f"Processed {rows_read} rows...")
+                continue
+            
+            # Extract and store Items
+            item_ids = df[COL_ITEM_ID]
+            item_names = df[COL_ITEM_NAME]
+            has_item = (item_ids != '') & (item_names != '')
+            self.items.update(zip(item_ids[has_item], item_names[has_item]))
+            
+            # Handle grouped detailed item IDs: rows with a blank (or Subtotal) ID belong
+            # to the last detailed item seen
+            detailed_item_ids_raw = df[COL_DETAILED_ITEM_ID]
+            detailed_item_names = df[COL_DETAILED_ITEM_NAME]
+            new_detailed_item = (detailed_item_ids_raw != '') & (detailed_item_ids_raw != 'Subtotal')
+            detailed_item_ids = detailed_item_ids_raw.where(new_detailed_item).ffill()
+            if current_detailed_item_id is not None:
+                detailed_item_ids = detailed_item_ids.fillna(current_detailed_item_id)
+            
+            # Store the detailed item when we encounter its ID
+            has_detailed_item = new_detailed_item & (detailed_item_names != '')
+            self.detailed_items.update(
+                (detailed_item_id, {'detailedItemName': detailed_item_name, 'itemId': item_id or None})
+                for detailed_item_id, detailed_item_name, item_id in zip(
+                    detailed_item_ids_raw[has_detailed_item],
+                    detailed_item_names[has_detailed_item],
+                    item_ids[has_detailed_item]
+                )
+            )
+            
+            # Extract and store Sectors - blank sector mapping IDs are grouped like detailed items
+            sector_mapping_ids = df[COL_SECTOR_MAPPING_ID].replace('', pd.NA).ffill()
+            if current_sector_mapping_id is not None:
+                sector_mapping_ids = sector_mapping_ids.fillna(current_sector_mapping_id)
+            sector_names = df[COL_SECTOR_NAME]
+            has_sector = sector_mapping_ids.notna() & (sector_names != '')
+            self.sectors.update(zip(sector_mapping_ids[has_sector], sector_names[has_sector]))
+            
+            if pd.notna(detailed_item_ids.iloc[-1]):
+                current_detailed_item_id = detailed_item_ids.iloc[-1]
+            if pd.notna(sector_mapping_ids.iloc[-1]):
+                current_sector_mapping_id = sector_mapping_ids.iloc[-1]
+            
+            # Normalize organisation ID to handle case variations (treat as same organisation)
+            organisation_ids = df[COL_ORGANISATION_ID].str.upper()
+            validation_dates = parse_validation_dates(df[COL_VALIDATION_DATE])
+            latitudes = _float_column(df[COL_LATITUDE])
+            longitudes = _float_column(df[COL_LONGITUDE])
+            
+            # Store/update organisation info, merging data from multiple rows: each field
+            # takes the first non-empty value seen for the organisation
+            organisations = pd.DataFrame({
+                'organisationId': organisation_ids,
+                'organisationName': df[COL_ORGANISATION_NAME],
+                'billingStreet': df[COL_BILLING_STREET],
+                'billingCity': df[COL_BILLING_CITY],
+                'billingStateProvince': df[COL_BILLING_STATE],
+                'billingZipPostalCode': df[COL_BILLING_POSTCODE],
+                'formattedAddress': df[COL_FORMATTED_ADDRESS],
+                # A zero coordinate counts as missing while looking for a value (see below)
+                'latitude': latitudes.where(latitudes != 0),
+                'longitude': longitudes.where(longitudes != 0)
+            })
+            organisations = organisations.where(organisations != '')
+            merged = organisations.groupby('organisationId', sort=False).first()
+            # An organisation with no non-zero coordinate keeps whatever its first row had,
+            # so a lone 0 stays 0 rather than becoming NULL
+            first_coordinates = pd.DataFrame({
+                'organisationId': organisation_ids,
+                'latitude': latitudes,
+                'longitude': longitudes
+            }).drop_duplicates('organisationId').set_index('organisationId')
+            merged['latitude'] = merged['latitude'].fillna(first_coordinates['latitude'])
+            merged['longitude'] = merged['longitude'].fillna(first_coordinates['longitude'])
+            organisations = merged.reset_index()
+            organisations = organisations.astype(object).where(organisations.notna(), None)
             
-            for row_num, row in enumerate(reader, start=2):  # Start at 2 since header is row 1
-                # Skip rows without valid organisation data
-                if not row.get('Organisation: Organisation ID') or row.get('Organisation: Organisation ID').strip() == '':
-                    continue
-                
-                # Extract and store Items
-                item_id = row.get('Item ID', '').strip()
-                item_name = row.get('Item Name', '').strip()
-                if item_id and item_name:
-                    self.items[item_id] = item_name
-                
-                # Handle grouped detailed item IDs (handle BOM in column name)
-                detailed_item_id_raw = row.get('\ufeffDetailed Item ID  ↓', '') or row.get('Detailed Item ID  ↓', '')
-                detailed_item_id_raw = detailed_item_id_raw.strip()
-                detailed_item_name = row.get('Detailed Item Name', '').strip()
-                
-                # If we have a new detailed item ID, update our current one
-                if detailed_item_id_raw and detailed_item_id_raw != 'Subtotal':
-                    current_detailed_item_id = detailed_item_id_raw
-                    # Store the detailed item when we first encounter it
-                    if detailed_item_name:
-                        self.detailed_items[current_detailed_item_id] = {
-                            'detailedItemName': detailed_item_name,
-                            'itemId': item_id if item_id else None
-                        }
-                
-                # Use the current detailed item ID for this organisation
-                detailed_item_id = current_detailed_item_id
-                
-                # Extract and store Sectors - handle grouped rows like detailed items
-                sector_mapping_id_raw = row.get('Sector Mapping ID', '').strip()
-                sector_name = row.get('Sector Name', '').strip()
-                
-                # If we have a new sector mapping ID, update current tracking
-                if sector_mapping_id_raw:
-                    current_sector_mapping_id = sector_mapping_id_raw
-                    sector_mapping_id = sector_mapping_id_raw
-                else:
-                    # Use the current sector mapping ID from previous rows
-                    sector_mapping_id = current_sector_mapping_id
-                
-                # Store sector if we have both ID and name
-                if sector_mapping_id and sector_name:
-                    self.sectors[sector_mapping_id] = sector_name
-                
-                # Extract Organisation and Capability data
-                organisation_id_raw = row.get('Organisation: Organisation ID', '').strip()
-                # Normalize organisation ID to handle case variations (treat as same organisation)
-                organisation_id = organisation_id_raw.upper() if organisation_id_raw else ''
-                if organisation_id:
-                    # Parse validation date
-                    validation_date = None
-                    date_str = row.get('Validation Date', '').strip()
-                    if date_str:
-                        try:
-                            # Handle different date formats
-                            if '/' in date_str:
-                                validation_date = datetime.strptime(date_str, '%d/%m/%Y').strftime('%Y-%m-%d')
-                            else:
-                                validation_date = date_str
-                        except ValueError:
-                            validation_date = None
-                    
-                    # Parse coordinates
-                    latitude = None
-                    longitude = None
-                    try:
-                        lat_str = row.get('Latitude', '').strip()
-                        lon_str = row.get('Longitude', '').strip()
-                        if lat_str and lat_str != '':
-                            latitude = float(lat_str)
-                        if lon_str and lon_str != '':
-                            longitude = float(lon_str)
-                    except (ValueError, TypeError):
-                        pass
-                    
-                    # Store/update organisation info (merge data from multiple rows)
-                    if organisation_id not in self.organisations:
-                        # First time seeing this organisation
-                        organisation = {
-                            'organisationId': organisation_id,
-                            'organisationName': row.get('Organisation: Organisation Name', '').strip() or None,
-                            'billingStreet': row.get('Organisation: Billing Street', '').strip() or None,
-                            'billingCity': row.get('Organisation: Billing City', '').strip() or None,
-                            'billingStateProvince': row.get('Organisation: Billing State/Province', '').strip() or None,
-                            'billingZipPostalCode': row.get('Organisation: Billing Zip/Postal Code', '').strip() or None,
-                            'formattedAddress': row.get('Formatted_Address', '').strip() or None,
-                            'latitude': latitude,
-                            'longitude': longitude
-                        }
-                        self.organisations[organisation_id] = organisation
-                    else:
-                        # Update existing organisation with any missing data
-                        existing = self.organisations[organisation_id]
-                        
-                        # Update fields if they're currently None/empty and we have new data
-                        if not existing['organisationName']:
-                            existing['organisationName'] = row.get('Organisation: Organisation Name', '').strip() or None
-                        if not existing['billingStreet']:
-                            existing['billingStreet'] = row.get('Organisation: Billing Street', '').strip() or None
-                        if not existing['billingCity']:
-                            existing['billingCity'] = row.get('Organisation: Billing City', '').strip() or None
-                        if not existing['billingStateProvince']:
-                            existing['billingStateProvince'] = row.get('Organisation: Billing State/Province', '').strip() or None
-                        if not existing['billingZipPostalCode']:
-                            existing['billingZipPostalCode'] = row.get('Organisation: Billing Zip/Postal Code', '').strip() or None
-                        if not existing['formattedAddress']:
-                            existing['formattedAddress'] = row.get('Formatted_Address', '').strip() or None
-                        if not existing['latitude'] and latitude:
-                            existing['latitude'] = latitude
-                        if not existing['longitude'] and longitude:
-                            existing['longitude'] = longitude
-                    
-                    # Store capability record
-                    organisation_capability = row.get('Organisation Capability', '').strip()
-                    if organisation_capability:
-                        capability = {
-                            'organisationCapability': organisation_capability,
-                            'organisationId': organisation_id,  # Use normalized (uppercase) organisation ID
-                            'itemId': item_id if item_id else None,
-                            'detailedItemId': detailed_item_id if detailed_item_id else None,
-                            'capabilityType': row.get('Capability Type', '').strip() or None,
-                            'validationDate': validation_date,
-                            'sectorMappingId': sector_mapping_id if sector_mapping_id else None
-                        }
-                        self.capabilities.append(capability)
-                
-                if row_num % 100 == 0:
-                    print(f"Processed {row_num} rows...")
+            for record in organisations.to_dict('records'):
+                organisation = Organisation(**record)
+                existing = self.organisations.setdefault(organisation.organisationId, organisation)
+                if existing is not organisation:
+                    # Seen in an earlier chunk; fill in whatever is still missing
+                    existing.merge(organisation)
+            
+            # Store capability records
+            organisation_capabilities = df[COL_CAPABILITY]
+            capabilities = pd.DataFrame({
+                'organisationCapability': organisation_capabilities,
+                'organisationId': organisation_ids,  # Use normalized (uppercase) organisation ID
+                'itemId': item_ids,
+                'detailedItemId': detailed_item_ids,
+                'capabilityType': df[COL_CAPABILITY_TYPE],
+                'validationDate': validation_dates,
+                'sectorMappingId': sector_mapping_ids
+            })[organisation_capabilities != ''].astype(object)
+            capabilities = capabilities.where(capabilities.notna() & (capabilities != ''), None)
+            self.capabilities.extend(capabilities.to_dict('records'))
+            
+            print(f"Processed {rows_read} rows...")
         
         print(f"Extraction complete!")
         print(f"Found {len(self.items)} unique items")
@@ -168,80 +284,78 @@ class DataNormalizer:
         print(f"Found {len(self.capabilities)} capabilities")
     
     def generate_sql_inserts(self, output_file: str):
-        """Generate SQL INSERT statements for all tables"""
+        """Generate batched multi-row SQL INSERT statements for all tables in one transaction"""
         
         print(f"Generating SQL INSERT statements to {output_file}...")
         
+        buf = io.StringIO()
+        buf.write("-- SQL INSERT statements for ICN Database\n")
+        buf.write("-- Generated from alldata_with_coordinates.csv\n\n")
+        buf.write("BEGIN;\n\n")
+        
         with open(output_file, 'w', encoding='utf-8') as f:
-            f.write("-- SQL INSERT statements for ICN Database\n")
-            f.write("-- Generated from alldata_with_coordinates.csv\n\n")
-            
             # Items table inserts
-            f.write("-- Items table inserts\n")
-            for item_id, item_name in self.items.items():
-                escaped_name = item_name.replace("'", "''")
-                f.write(f"INSERT INTO Items (itemId, itemName) VALUES ('{item_id}', '{escaped_name}');\n")
-            f.write("\n")
+            buf.write("-- Items table inserts\n")
+            _write_inserts(f, buf, 'Items', ITEM_COLUMNS, self.items.items())
+            buf.write("\n")
             
             # DetailedItems table inserts
-            f.write("-- DetailedItems table inserts\n")
-            for detailed_item_id, data in self.detailed_items.items():
-                escaped_name = data['detailedItemName'].replace("'", "''")
-                item_id_value = f"'{data['itemId']}'" if data['itemId'] else 'NULL'
-                f.write(f"INSERT INTO DetailedItems (detailedItemId, detailedItemName, itemId) VALUES ('{detailed_item_id}', '{escaped_name}', {item_id_value});\n")
-            f.write("\n")
+            buf.write("-- DetailedItems table inserts\n")
+            _write_inserts(f, buf, 'DetailedItems', DETAILED_ITEM_COLUMNS, (
+                (detailed_item_id, data['detailedItemName'], data['itemId'])
+                for detailed_item_id, data in self.detailed_items.items()
+            ))
+            buf.write("\n")
             
             # Sectors table inserts
-            f.write("-- Sectors table inserts\n")
-            for sector_id, sector_name in self.sectors.items():
-                escaped_name = sector_name.replace("'", "''")
-                f.write(f"INSERT INTO Sectors (sectorMappingId, sectorName) VALUES ('{sector_id}', '{escaped_name}');\n")
-            f.write("\n")
-            
-            # Escape string values and handle NULLs
-            def format_value(value):
-                if value is None or value == '':
-                    return 'NULL'
-                elif isinstance(value, (int, float)):
-                    return str(value)
-                else:
-                    return f"'{str(value).replace(chr(39), chr(39)+chr(39))}'"
+            buf.write("-- Sectors table inserts\n")
+            _write_inserts(f, buf, 'Sectors', SECTOR_COLUMNS, self.sectors.items())
+            buf.write("\n")
             
             # Organisations table inserts
-            f.write("-- Organisations table inserts\n")
-            for org_id, org in self.organisations.items():
-                values = [
-                    format_value(org['organisationId']),
-                    format_value(org['organisationName']),
-                    format_value(org['billingStreet']),
-                    format_value(org['billingCity']),
-                    format_value(org['billingStateProvince']),
-                    format_value(org['billingZipPostalCode']),
-                    format_value(org['formattedAddress']),
-                    format_value(org['latitude']),
-                    format_value(org['longitude'])
-                ]
-                
-                f.write(f"INSERT INTO Organisations (organisationId, organisationName, billingStreet, billingCity, billingStateProvince, billingZipPostalCode, formattedAddress, latitude, longitude) VALUES ({', '.join(values)});\n")
-            f.write("\n")
+            buf.write("-- Organisations table inserts\n")
+            _write_inserts(f, buf, 'Organisations', ORGANISATION_COLUMNS,
+                           map(attrgetter(*ORGANISATION_COLUMNS), self.organisations.values()))
+            buf.write("\n")
             
             # Capabilities table inserts
-            f.write("-- Capabilities table inserts\n")
-            for cap in self.capabilities:
-                values = [
-                    format_value(cap['organisationCapability']),
-                    format_value(cap['organisationId']),
-                    format_value(cap['itemId']),
-                    format_value(cap['detailedItemId']),
-                    format_value(cap['capabilityType']),
-                    format_value(cap['validationDate']),
-                    format_value(cap['sectorMappingId'])
-                ]
-                
-                f.write(f"INSERT INTO Capabilities (organisationCapability, organisationId, itemId, detailedItemId, capabilityType, validationDate, sectorMappingId) VALUES ({', '.join(values)});\n")
+            buf.write("-- Capabilities table inserts\n")
+            _write_inserts(f, buf, 'Capabilities', CAPABILITY_COLUMNS,
+                           map(itemgetter(*CAPABILITY_COLUMNS), self.capabilities))
+            buf.write("\n")
+            
+            buf.write("COMMIT;\n")
+            _flush_buffer(f, buf)
             
         print(f"SQL INSERT statements generated successfully!")
     
+    def generate_copy_script(self, output_file: str, csv_dir: str):
+        """
+        Generate a PostgreSQL (psql) load script that bulk-loads the CSV files
+        written by export_to_csv with \\copy instead of INSERT statements
+        """
+        
+        print(f"Generating PostgreSQL COPY script to {output_file}...")
+        
+        tables = [
+            ('Items', ITEM_COLUMNS, 'items.csv'),
+            ('DetailedItems', DETAILED_ITEM_COLUMNS, 'detailed_items.csv'),
+            ('Sectors', SECTOR_COLUMNS, 'sectors.csv'),
+            ('Organisations', ORGANISATION_COLUMNS, 'organisations.csv'),
+            ('Capabilities', CAPABILITY_COLUMNS, 'capabilities.csv')
+        ]
+        
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write("-- PostgreSQL COPY script for ICN Database (run with psql)\n")
+            f.write(f"-- Loads the normalized CSV files in {csv_dir}\n\n")
+            f.write("BEGIN;\n")
+            for table, columns, csv_name in tables:
+                csv_path = os.path.join(csv_dir, csv_name).replace("'", "''")
+                f.write(f"\\copy {table} ({', '.join(columns)}) FROM '{csv_path}' WITH (FORMAT csv, HEADER true)\n")
+            f.write("COMMIT;\n")
+        
+        print(f"PostgreSQL COPY script generated successfully!")
+    
     def export_to_csv(self, output_dir: str):
         """Export normalized data to separate CSV files"""
         
@@ -276,11 +390,11 @@ class DataNormalizer:
                 'billingStateProvince', 'billingZipPostalCode', 'formattedAddress',
                 'latitude', 'longitude'
             ])
-            for org_id, org in self.organisations.items():
+            for org in self.organisations.values():
                 writer.writerow([
-                    org['organisationId'], org['organisationName'], org['billingStreet'],
-                    org['billingCity'], org['billingStateProvince'], org['billingZipPostalCode'],
-                    org['formattedAddress'], org['latitude'], org['longitude']
+                    org.organisationId, org.organisationName, org.billingStreet,
+                    org.billingCity, org.billingStateProvince, org.billingZipPostalCode,
+                    org.formattedAddress, org.latitude, org.longitude
                 ])
         
         # Capabilities CSV
@@ -306,19 +420,24 @@ def main():
     parser.add_argument('-c', '--csv-dir', help='Output directory for CSV files', default='normalized_csv')
     parser.add_argument('--sql-only', action='store_true', help='Generate only SQL file')
     parser.add_argument('--csv-only', action='store_true', help='Generate only CSV files')
+    parser.add_argument('--postgres-copy', action='store_true',
+                        help='Write a psql \\copy script loading the CSV files instead of INSERT statements')
     
     args = parser.parse_args()
     
     normalizer = DataNormalizer()
     normalizer.process_csv(args.input_file)
     
-    if not args.csv_only:
-        normalizer.generate_sql_inserts(args.sql)
-    
-    if not args.sql_only:
-        import os
+    # The COPY script loads the exported CSV files, so they are always written in that mode
+    if not args.sql_only or args.postgres_copy:
         os.makedirs(args.csv_dir, exist_ok=True)
         normalizer.export_to_csv(args.csv_dir)
+    
+    if not args.csv_only:
+        if args.postgres_copy:
+            normalizer.generate_copy_script(args.sql, args.csv_dir)
+        else:
+            normalizer.generate_sql_inserts(args.sql)
 
 if __name__ == '__main__':
     main()